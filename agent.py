@@ -1,19 +1,28 @@
 #!/usr/bin/env python3
 """OpenAI chat agent with CRM tools and shadow database capabilities."""
 
+import atexit
 import json
 import os
 import sqlite3
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
 from datetime import datetime
+from functools import lru_cache
+from itertools import chain, islice
 
+import orjson
 import requests
 from openai import OpenAI
+from requests.adapters import HTTPAdapter
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 from rich.text import Text
 from rich.markdown import Markdown
+from urllib3.util.retry import Retry
 
 # --- Config ---
 CRM_BASE_URL = os.environ.get("CRM_BASE_URL", "http://localhost:5555")
@@ -23,15 +32,173 @@ MODEL = os.environ.get("OPENAI_MODEL", "gpt-5.2")
 console = Console()
 client = OpenAI()
 
+# Shared keep-alive pool for CRM calls. Rate-limit and outage responses are
+# retried by the adapter; the final response is still returned to the caller.
+_session = requests.Session()
+_session.mount(CRM_BASE_URL, HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=(429, 503), raise_on_status=False),
+))
+
 # --- Shadow DB state ---
 _shadow_db_exists = False
 _last_sync_time: str | None = None
+_conn: sqlite3.Connection | None = None
+_db_lock = threading.Lock()
+# Serve repeated SELECTs from memory; cleared whenever the shadow DB is written.
+_CACHE_READS = True
+
+
+def _get_conn() -> sqlite3.Connection:
+    """Return the long-lived shadow database connection, opening it on first use.
+
+    Callers must hold ``_db_lock`` while using the connection.
+    """
+    global _conn
+    if _conn is None:
+        # Room for every tool query plus both shapes of each bulk INSERT
+        conn = sqlite3.connect(SHADOW_DB_PATH, check_same_thread=False, isolation_level=None, cached_statements=256)
+        # page_size only applies to a brand-new file and must precede the
+        # switch to WAL; on an existing database it is a no-op.
+        conn.execute("PRAGMA page_size=8192")
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-65536")  # 64 MiB
+        conn.execute("PRAGMA mmap_size=268435456")  # 256 MiB
+        _conn = conn
+    return _conn
+
+
+atexit.register(lambda: _conn and _conn.close())
+
+# Secondary indexes on the shadow tables: (name, table, columns).
+_SHADOW_INDEXES = (
+    ("idx_contacts_company", "contacts", "company"),
+    ("idx_deals_company", "deals", "company"),
+    ("idx_deals_amount", "deals", "amount"),
+)
+
+
+def _create_indexes(conn: sqlite3.Connection, table: str | None = None):
+    for name, tbl, columns in _SHADOW_INDEXES:
+        if table is None or tbl == table:
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {tbl}({columns})")
+
+
+def _drop_indexes(conn: sqlite3.Connection, table: str):
+    for name, tbl, _ in _SHADOW_INDEXES:
+        if tbl == table:
+            conn.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+# Column order for synced rows, shared by the row builders and _bulk_insert.
+_CONTACT_COLUMNS = ("id", "first_name", "last_name", "email", "company", "title", "phone", "created_at")
+_DEAL_COLUMNS = ("id", "name", "company", "amount", "stage", "close_date", "contact_id", "created_at")
+
+
+def _contact_rows(contacts: list[dict]) -> list[tuple]:
+    """Normalize CRM contacts into insert-ready tuples in _CONTACT_COLUMNS order."""
+    return [(c["id"], c["first_name"], c["last_name"], c["email"], c["company"], c["title"], c.get("phone") or "", c["created_at"])
+            for c in contacts]
+
+
+def _deal_rows(deals: list[dict]) -> list[tuple]:
+    """Normalize CRM deals into insert-ready tuples in _DEAL_COLUMNS order."""
+    return [(d["id"], d["name"], d["company"], d["amount"], d["stage"], d["close_date"], d.get("contact_id"), d["created_at"])
+            for d in deals]
+
+
+# Rows per multi-row INSERT: 8 columns x 64 rows = 512 bound parameters,
+# safely under SQLite's historical 999-variable limit.
+_INSERT_CHUNK_ROWS = 64
+
+
+def _bulk_insert(conn: sqlite3.Connection, table: str, columns: tuple[str, ...], rows: list[tuple]):
+    """INSERT OR REPLACE rows using multi-row VALUES statements.
+
+    Full chunks share one statement and the remainder goes through a
+    single-row statement, so each table only ever compiles two SQL strings.
+    """
+    prefix = f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) VALUES "
+    row_sql = "(" + ", ".join(["?"] * len(columns)) + ")"
+    split = len(rows) - len(rows) % _INSERT_CHUNK_ROWS
+    if split:
+        conn.executemany(
+            prefix + ", ".join([row_sql] * _INSERT_CHUNK_ROWS),
+            [tuple(chain.from_iterable(rows[i:i + _INSERT_CHUNK_ROWS])) for i in range(0, split, _INSERT_CHUNK_ROWS)],
+        )
+    if split < len(rows):
+        conn.executemany(prefix + row_sql, rows[split:])
+
+
+@contextmanager
+def _timed():
+    """Yield a dict that receives ``elapsed_seconds`` when the block exits."""
+    timing = {}
+    start = time.monotonic_ns()
+    try:
+        yield timing
+    finally:
+        timing["elapsed_seconds"] = round((time.monotonic_ns() - start) / 1e9, 4)
+
+
+# --- CRM read cache ---
+# Successful list responses keyed on "<resource>:<normalized params>".
+_CRM_CACHE_TTL = 30  # seconds
+_crm_cache: dict[str, tuple[float, dict]] = {}
+
+
+def _cache_get(key: str) -> dict | None:
+    """Return a fresh copy of a cached CRM response, or None if missing/expired."""
+    start = time.monotonic()
+    entry = _crm_cache.get(key)
+    if entry is None or start - entry[0] >= _CRM_CACHE_TTL:
+        return None
+    data = dict(entry[1])
+    data["elapsed_seconds"] = round(time.monotonic() - start, 4)
+    return data
+
+
+def _cache_put(key: str, data: dict):
+    _crm_cache[key] = (time.monotonic(), dict(data))
+
+
+def _cache_invalidate(resource: str):
+    """Drop every cached response for a resource (e.g. after a create)."""
+    for key in [k for k in _crm_cache if k.startswith(f"{resource}:")]:
+        _crm_cache.pop(key, None)
+
+
+def _cache_clear():
+    _crm_cache.clear()
 
 
 # ============================================================
 # Tool implementations
 # ============================================================
 
+def _crm_request(method: str, path: str, **kwargs) -> dict:
+    """Call the CRM API and return its JSON body, or an error dict, with timing."""
+    with _timed() as timing:
+        try:
+            resp = _session.request(method, f"{CRM_BASE_URL}{path}", timeout=10, **kwargs)
+        except requests.exceptions.ConnectionError:
+            resp = None
+
+    if resp is None:
+        return {"error": "Salesforce API is unreachable", **timing}
+    if resp.status_code == 429:
+        return {"error": "Rate limit exceeded (429)", **timing}
+    if resp.status_code == 503:
+        return {"error": "Salesforce API is down (503)", **timing}
+    resp.raise_for_status()
+    data = orjson.loads(resp.content)
+    data.update(timing)
+    return data
+
+
 def crm_list_contacts(filters: dict | None = None) -> dict:
     """Call the CRM API to list contacts."""
     params = {}
@@ -39,38 +206,22 @@ def crm_list_contacts(filters: dict | None = None) -> dict:
         if "company" in filters:
             params["company"] = filters["company"]
 
-    start = time.time()
-    try:
-        resp = requests.get(f"{CRM_BASE_URL}/api/contacts", params=params, timeout=10)
-        elapsed = time.time() - start
-        if resp.status_code == 429:
-            return {"error": "Rate limit exceeded (429)", "elapsed_seconds": round(elapsed, 2)}
-        if resp.status_code == 503:
-            return {"error": "Salesforce API is down (503)", "elapsed_seconds": round(elapsed, 2)}
-        resp.raise_for_status()
-        data = resp.json()
-        data["elapsed_seconds"] = round(elapsed, 2)
-        return data
-    except requests.exceptions.ConnectionError:
-        return {"error": "Salesforce API is unreachable", "elapsed_seconds": round(time.time() - start, 2)}
+    cache_key = f"contacts:{json.dumps(params, sort_keys=True)}"
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        return cached
+
+    data = _crm_request("GET", "/api/contacts", params=params)
+    if "error" not in data:
+        _cache_put(cache_key, data)
+    return data
 
 
 def crm_create_contact(data: dict) -> dict:
     """Call the CRM API to create a contact."""
-    start = time.time()
-    try:
-        resp = requests.post(f"{CRM_BASE_URL}/api/contacts", json=data, timeout=10)
-        elapsed = time.time() - start
-        if resp.status_code == 429:
-            return {"error": "Rate limit exceeded (429)", "elapsed_seconds": round(elapsed, 2)}
-        if resp.status_code == 503:
-            return {"error": "Salesforce API is down (503)", "elapsed_seconds": round(elapsed, 2)}
-        resp.raise_for_status()
-        result = resp.json()
-        result["elapsed_seconds"] = round(elapsed, 2)
-        return result
-    except requests.exceptions.ConnectionError:
-        return {"error": "Salesforce API is unreachable", "elapsed_seconds": round(time.time() - start, 2)}
+    result = _crm_request("POST", "/api/contacts", json=data)
+    _cache_invalidate("contacts")
+    return result
 
 
 def crm_list_deals(filters: dict | None = None) -> dict:
@@ -82,38 +233,22 @@ def crm_list_deals(filters: dict | None = None) -> dict:
         if "company" in filters:
             params["company"] = filters["company"]
 
-    start = time.time()
-    try:
-        resp = requests.get(f"{CRM_BASE_URL}/api/deals", params=params, timeout=10)
-        elapsed = time.time() - start
-        if resp.status_code == 429:
-            return {"error": "Rate limit exceeded (429)", "elapsed_seconds": round(elapsed, 2)}
-        if resp.status_code == 503:
-            return {"error": "Salesforce API is down (503)", "elapsed_seconds": round(elapsed, 2)}
-        resp.raise_for_status()
-        data = resp.json()
-        data["elapsed_seconds"] = round(elapsed, 2)
-        return data
-    except requests.exceptions.ConnectionError:
-        return {"error": "Salesforce API is unreachable", "elapsed_seconds": round(time.time() - start, 2)}
+    cache_key = f"deals:{json.dumps(params, sort_keys=True)}"
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        return cached
+
+    data = _crm_request("GET", "/api/deals", params=params)
+    if "error" not in data:
+        _cache_put(cache_key, data)
+    return data
 
 
 def crm_create_deal(data: dict) -> dict:
     """Call the CRM API to create a deal."""
-    start = time.time()
-    try:
-        resp = requests.post(f"{CRM_BASE_URL}/api/deals", json=data, timeout=10)
-        elapsed = time.time() - start
-        if resp.status_code == 429:
-            return {"error": "Rate limit exceeded (429)", "elapsed_seconds": round(elapsed, 2)}
-        if resp.status_code == 503:
-            return {"error": "Salesforce API is down (503)", "elapsed_seconds": round(elapsed, 2)}
-        resp.raise_for_status()
-        result = resp.json()
-        result["elapsed_seconds"] = round(elapsed, 2)
-        return result
-    except requests.exceptions.ConnectionError:
-        return {"error": "Salesforce API is unreachable", "elapsed_seconds": round(time.time() - start, 2)}
+    result = _crm_request("POST", "/api/deals", json=data)
+    _cache_invalidate("deals")
+    return result
 
 
 def create_local_db() -> dict:
@@ -121,49 +256,82 @@ def create_local_db() -> dict:
     global _shadow_db_exists
 
     start = time.time()
-    conn = sqlite3.connect(SHADOW_DB_PATH)
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS contacts (
-            id INTEGER PRIMARY KEY,
-            first_name TEXT, last_name TEXT, email TEXT,
-            company TEXT, title TEXT, phone TEXT, created_at TEXT
-        )
-    """)
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS deals (
-            id INTEGER PRIMARY KEY,
-            name TEXT, company TEXT, amount REAL, stage TEXT,
-            close_date TEXT, contact_id INTEGER, created_at TEXT
-        )
-    """)
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS pending_sync (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            table_name TEXT, operation TEXT, data TEXT,
-            created_at TEXT
-        )
-    """)
-    conn.commit()
-    conn.close()
+    with _db_lock:
+        conn = _get_conn()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS contacts (
+                id INTEGER PRIMARY KEY,
+                first_name TEXT, last_name TEXT, email TEXT,
+                company TEXT, title TEXT, phone TEXT, created_at TEXT
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS deals (
+                id INTEGER PRIMARY KEY,
+                name TEXT, company TEXT, amount REAL, stage TEXT,
+                close_date TEXT, contact_id INTEGER, created_at TEXT
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS pending_sync (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                table_name TEXT, operation TEXT, data TEXT,
+                created_at TEXT
+            )
+        """)
+        _create_indexes(conn)
     _shadow_db_exists = True
     elapsed = time.time() - start
 
     return {"message": "Local shadow database created", "path": SHADOW_DB_PATH, "elapsed_seconds": round(elapsed, 4)}
 
 
-def local_db_query(sql: str) -> dict:
-    """Run a read-only SQL query on the shadow database."""
-    if not _shadow_db_exists and not os.path.exists(SHADOW_DB_PATH):
+def _shadow_db_ready() -> bool:
+    """Whether the shadow DB exists; the file is only stat'ed until first seen."""
+    global _shadow_db_exists
+    if not _shadow_db_exists and os.path.exists(SHADOW_DB_PATH):
+        _shadow_db_exists = True
+    return _shadow_db_exists
+
+
+def _run_query(sql: str, limit: int | None) -> list[dict]:
+    # The connection autocommits, so wrap the statement in a transaction that
+    # is always rolled back: whatever SQL the model sends, the tool stays read-only.
+    with _db_lock:
+        conn = _get_conn()
+        conn.execute("BEGIN")
+        try:
+            cur = conn.execute(sql)
+            if cur.description is None:
+                results = []
+            else:
+                cols = [c[0] for c in cur.description]
+                results = [dict(zip(cols, row)) for row in islice(cur, limit)]
+            cur.close()
+        finally:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+    return results
+
+
+@lru_cache(maxsize=128)
+def _local_db_query_cached(sql: str, limit: int | None) -> tuple[dict, ...]:
+    return tuple(_run_query(sql, limit))
+
+
+def local_db_query(sql: str, limit: int | None = None) -> dict:
+    """Run a read-only SQL query on the shadow database, optionally capped at ``limit`` rows."""
+    if not _shadow_db_ready():
         return {"error": "Local database does not exist. Call create_local_db first."}
 
     start = time.time()
     try:
-        conn = sqlite3.connect(SHADOW_DB_PATH)
-        conn.row_factory = sqlite3.Row
-        rows = conn.execute(sql).fetchall()
-        conn.close()
+        if _CACHE_READS and sql.lstrip()[:6].upper() == "SELECT":
+            # Copy the cached rows so callers can't mutate the cache
+            results = [dict(r) for r in _local_db_query_cached(sql, limit)]
+        else:
+            results = _run_query(sql, limit)
         elapsed = time.time() - start
-        results = [dict(r) for r in rows]
         return {"results": results, "count": len(results), "elapsed_seconds": round(elapsed, 4)}
     except Exception as e:
         return {"error": str(e)}
@@ -171,19 +339,18 @@ def local_db_query(sql: str) -> dict:
 
 def local_db_insert(table: str, data: dict) -> dict:
     """Insert a row into the shadow database."""
-    if not _shadow_db_exists and not os.path.exists(SHADOW_DB_PATH):
+    if not _shadow_db_ready():
         return {"error": "Local database does not exist. Call create_local_db first."}
     if not table or not data:
         return {"error": "Both 'table' and 'data' are required."}
 
     start = time.time()
     try:
-        conn = sqlite3.connect(SHADOW_DB_PATH)
         columns = ", ".join(data.keys())
         placeholders = ", ".join(["?"] * len(data))
-        conn.execute(f"INSERT OR REPLACE INTO {table} ({columns}) VALUES ({placeholders})", list(data.values()))
-        conn.commit()
-        conn.close()
+        with _db_lock:
+            _get_conn().execute(f"INSERT OR REPLACE INTO {table} ({columns}) VALUES ({placeholders})", list(data.values()))
+        _local_db_query_cached.cache_clear()
         elapsed = time.time() - start
         return {"message": f"Inserted into {table}", "elapsed_seconds": round(elapsed, 4)}
     except Exception as e:
@@ -201,49 +368,55 @@ def sync_crm_to_local() -> dict:
     results = {"contacts_synced": 0, "deals_synced": 0, "errors": []}
     start = time.time()
 
-    # Sync contacts
-    contact_data = crm_list_contacts()
+    # Fetch contacts and deals concurrently; both are slow, independent API calls
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        contacts_future = executor.submit(crm_list_contacts)
+        deals_future = executor.submit(crm_list_deals)
+        contact_data, deal_data = contacts_future.result(), deals_future.result()
+
     if "error" in contact_data:
         results["errors"].append(f"Contacts: {contact_data['error']}")
-        # Try again after a brief pause if rate limited
-        if "429" in contact_data.get("error", ""):
-            time.sleep(2)
-            contact_data = crm_list_contacts()
-            if "error" in contact_data:
-                results["errors"].append(f"Contacts retry: {contact_data['error']}")
+    if "error" in deal_data:
+        results["errors"].append(f"Deals: {deal_data['error']}")
 
+    # Sync contacts
     if "contacts" in contact_data:
-        conn = sqlite3.connect(SHADOW_DB_PATH)
-        for c in contact_data["contacts"]:
-            conn.execute(
-                "INSERT OR REPLACE INTO contacts (id, first_name, last_name, email, company, title, phone, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
-                (c["id"], c["first_name"], c["last_name"], c["email"], c["company"], c["title"], c.get("phone", ""), c["created_at"]),
-            )
-        conn.commit()
-        conn.close()
+        rows = _contact_rows(contact_data["contacts"])
+        with _db_lock:
+            conn = _get_conn()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Bulk load without index maintenance, then rebuild once
+                _drop_indexes(conn, "contacts")
+                _bulk_insert(conn, "contacts", _CONTACT_COLUMNS, rows)
+                _create_indexes(conn, "contacts")
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
         results["contacts_synced"] = len(contact_data["contacts"])
 
     # Sync deals
-    deal_data = crm_list_deals()
-    if "error" in deal_data:
-        results["errors"].append(f"Deals: {deal_data['error']}")
-        if "429" in deal_data.get("error", ""):
-            time.sleep(2)
-            deal_data = crm_list_deals()
-            if "error" in deal_data:
-                results["errors"].append(f"Deals retry: {deal_data['error']}")
-
     if "deals" in deal_data:
-        conn = sqlite3.connect(SHADOW_DB_PATH)
-        for d in deal_data["deals"]:
-            conn.execute(
-                "INSERT OR REPLACE INTO deals (id, name, company, amount, stage, close_date, contact_id, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
-                (d["id"], d["name"], d["company"], d["amount"], d["stage"], d["close_date"], d.get("contact_id"), d["created_at"]),
-            )
-        conn.commit()
-        conn.close()
+        rows = _deal_rows(deal_data["deals"])
+        with _db_lock:
+            conn = _get_conn()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Bulk load without index maintenance, then rebuild once
+                _drop_indexes(conn, "deals")
+                _bulk_insert(conn, "deals", _DEAL_COLUMNS, rows)
+                _create_indexes(conn, "deals")
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
         results["deals_synced"] = len(deal_data["deals"])
 
+    # The local DB now holds the fresh copy; drop stale API and query results
+    _cache_clear()
+    _local_db_query_cached.cache_clear()
+
     elapsed = time.time() - start
     _last_sync_time = datetime.now().isoformat()
     results["elapsed_seconds"] = round(elapsed, 2)
@@ -256,7 +429,10 @@ def sync_crm_to_local() -> dict:
 # OpenAI Tool Definitions
 # ============================================================
 
-TOOLS = [
+# Built once at import and passed as-is to every completion request. The tuple
+# only stops tools being added, removed or reordered; the nested schema dicts
+# are still mutable and must not be modified.
+TOOLS = (
     {
         "type": "function",
         "function": {
@@ -364,7 +540,8 @@ TOOLS = [
             "parameters": {
                 "type": "object",
                 "properties": {
-                    "sql": {"type": "string", "description": "SQL query to execute"}
+                    "sql": {"type": "string", "description": "SQL query to execute"},
+                    "limit": {"type": "integer", "description": "Optional maximum number of rows to return"}
                 },
                 "required": ["sql"]
             }
@@ -393,7 +570,7 @@ TOOLS = [
             "parameters": {"type": "object", "properties": {}}
         }
     },
-]
+)
 
 SYSTEM_PROMPT = """\
 You are a CRM assistant that helps users manage their Salesforce contacts and deals.
@@ -440,17 +617,31 @@ TOOL_DISPATCH = {
     "crm_list_deals": lambda args: crm_list_deals(args.get("filters")),
     "crm_create_deal": lambda args: crm_create_deal(args.get("data", args)),
     "create_local_db": lambda args: create_local_db(),
-    "local_db_query": lambda args: local_db_query(args.get("sql", "")),
+    "local_db_query": lambda args: local_db_query(args.get("sql", ""), args.get("limit")),
     "local_db_insert": lambda args: local_db_insert(args.get("table", ""), args.get("data", {})),
     "sync_crm_to_local": lambda args: sync_crm_to_local(),
 }
 
+# Tools that mutate the CRM or the shadow DB. These never overlap with other
+# tool calls from the same turn; read-only tools run concurrently. local_db_query
+# counts as a read whatever its SQL, since _run_query rolls every statement back.
+_WRITE_TOOLS = {"crm_create_contact", "crm_create_deal", "create_local_db", "local_db_insert", "sync_crm_to_local"}
+_TOOL_EXECUTOR = ThreadPoolExecutor(max_workers=4)
+
 
 def display_tool_call(name: str, args: dict):
     """Show a tool call in the terminal."""
-    args_str = json.dumps(args, indent=2) if args else ""
     label = f"[bold cyan]Tool Call:[/bold cyan] [yellow]{name}[/yellow]"
-    if args_str and len(args_str) < 200:
+    if not args:
+        console.print(f"  {label}")
+        return
+
+    try:
+        args_str = orjson.dumps(args, option=orjson.OPT_INDENT_2).decode()
+    except TypeError:
+        # orjson rejects some values json.loads accepts, e.g. ints over 64 bits
+        args_str = json.dumps(args, indent=2)
+    if len(args_str) < 200:
         console.print(Panel(args_str, title=label, border_style="cyan", width=80))
     else:
         console.print(f"  {label}")
@@ -500,7 +691,7 @@ def run_tool(name: str, args_json: str) -> str:
             result = {"error": f"Tool execution failed: {e}"}
 
     display_tool_result(name, result)
-    return json.dumps(result)
+    return orjson.dumps(result).decode()
 
 
 # ============================================================
@@ -511,12 +702,17 @@ def chat(user_message: str, messages: list[dict]) -> tuple[str, list[dict]]:
     """Send a message and process the response, handling tool calls."""
     messages.append({"role": "user", "content": user_message})
 
+    # SYSTEM_PROMPT and TOOLS form a static prefix and new turns are only ever
+    # appended, so the provider's automatic prompt cache can reuse it; a stable
+    # prompt_cache_key keeps requests routed to the same cache. It goes through
+    # extra_body because older SDKs allowed by openai>=1.0 lack the kwarg.
     while True:
         response = client.chat.completions.create(
             model=MODEL,
             messages=messages,
             tools=TOOLS,
             temperature=0.3,
+            extra_body={"prompt_cache_key": "shadowdb-agent"},
         )
 
         msg = response.choices[0].message
@@ -526,13 +722,22 @@ def chat(user_message: str, messages: list[dict]) -> tuple[str, list[dict]]:
         if not msg.tool_calls:
             return msg.content or "", messages
 
-        # Process tool calls
+        # Process tool calls: reads fan out, writes act as barriers so they
+        # see every earlier call finished and finish before any later one.
+        futures = []
         for tool_call in msg.tool_calls:
-            result = run_tool(tool_call.function.name, tool_call.function.arguments)
+            is_write = tool_call.function.name in _WRITE_TOOLS
+            if is_write:
+                wait(futures)
+            futures.append(_TOOL_EXECUTOR.submit(run_tool, tool_call.function.name, tool_call.function.arguments))
+            if is_write:
+                wait(futures)
+
+        for tool_call, future in zip(msg.tool_calls, futures):
             messages.append({
                 "role": "tool",
                 "tool_call_id": tool_call.id,
-                "content": result,
+                "content": future.result(),
             })
 
 
@@ -108,9 +108,10 @@ def run_demo():
     ))
     pause(2)
 
-    # Clean up any previous shadow DB
-    if os.path.exists(SHADOW_DB_PATH):
-        os.remove(SHADOW_DB_PATH)
+    # Clean up any previous shadow DB (including its WAL sidecar files)
+    for path in (SHADOW_DB_PATH, SHADOW_DB_PATH + "-wal", SHADOW_DB_PATH + "-shm"):
+        if os.path.exists(path):
+            os.remove(path)
 
     # Ensure server is ready
     reset_server()
@@ -1,61 +1,170 @@
 #!/usr/bin/env python3
 """Mock Salesforce CRM API with artificial delays, rate limiting, and down mode."""
 
+# Patch before anything imports socket/time/threading so the artificial
+# delays and socket I/O yield to other greenlets instead of blocking.
+from gevent import monkey
+monkey.patch_all()
+
 import os
+import queue
 import sqlite3
+import sys
 import time
 import threading
-from flask import Flask, request, jsonify
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+import orjson
+from flask import Flask, Response, request, jsonify, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 
 from seed_data import seed, DB_PATH
 
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson for both encoding and decoding."""
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 
 # --- Configuration ---
-READ_DELAY = 2.0       # seconds delay for GET requests
-WRITE_DELAY = 1.5      # seconds delay for POST requests
+# Artificial latency; set CRM_READ_DELAY / CRM_WRITE_DELAY to 0 for benchmarks
+READ_DELAY = float(os.environ.get("CRM_READ_DELAY", "2.0"))    # seconds delay for GET requests
+WRITE_DELAY = float(os.environ.get("CRM_WRITE_DELAY", "1.5"))  # seconds delay for POST requests
 RATE_LIMIT = 5          # max requests per window
 RATE_WINDOW = 10        # window in seconds
+DB_POOL_SIZE = 8        # idle connections kept for reuse
+
+CONTACT_REQUIRED = frozenset(("first_name", "last_name", "email", "company", "title"))
+DEAL_REQUIRED = frozenset(("name", "company", "amount", "stage", "close_date"))
 
 # --- State ---
 _down_mode = False
-_down_lock = threading.Lock()
+_down_lock = threading.Lock()  # serializes toggles; reads need no lock
 
-_request_timestamps: list[float] = []
+# Sliding window: monotonic timestamps of the requests in the last RATE_WINDOW
+# seconds. Expired ones are popped off the left, so each check is amortized O(1).
+_request_times: deque[float] = deque()
 _rate_lock = threading.Lock()
 
+_db_pool: queue.LifoQueue = queue.LifoQueue(maxsize=DB_POOL_SIZE)
+
 
 def _is_down() -> bool:
-    with _down_lock:
-        return _down_mode
+    # Loading a module-level bool is atomic under the GIL (and gevent only
+    # switches at I/O), so the hot read path skips the lock.
+    return _down_mode
+
+
+def _prune(now: float):
+    """Drop timestamps older than the window. Caller must hold ``_rate_lock``."""
+    while _request_times and now - _request_times[0] >= RATE_WINDOW:
+        _request_times.popleft()
 
 
 def _check_rate_limit() -> bool:
     """Returns True if rate limited."""
-    now = time.time()
+    now = time.monotonic()
     with _rate_lock:
-        # Prune old timestamps
-        _request_timestamps[:] = [t for t in _request_timestamps if now - t < RATE_WINDOW]
-        if len(_request_timestamps) >= RATE_LIMIT:
+        _prune(now)
+        if len(_request_times) >= RATE_LIMIT:
             return True
-        _request_timestamps.append(now)
+        _request_times.append(now)
         return False
 
 
-def get_db():
-    conn = sqlite3.connect(DB_PATH)
+def _open_db() -> sqlite3.Connection:
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False, isolation_level=None)
     conn.row_factory = sqlite3.Row
+    # Tuned once per pooled connection, not per request
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA cache_size=-64000")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA busy_timeout=5000")
+    conn.execute("PRAGMA mmap_size=268435456")
     return conn
 
 
+@contextmanager
+def get_db():
+    """Borrow a pooled connection for the duration of a request.
+
+    Connections are opened on demand (the DB may not be seeded at import time)
+    and up to DB_POOL_SIZE idle ones are kept for reuse.
+    """
+    try:
+        conn = _db_pool.get_nowait()
+    except queue.Empty:
+        conn = _open_db()
+    try:
+        yield conn
+    finally:
+        try:
+            _db_pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+
+def json_body() -> dict | None:
+    """Decode the request body as a JSON object, or return None if it isn't one.
+
+    Reads the raw bytes straight into orjson, skipping Flask's cached
+    request.json property and its content-type checks.
+    """
+    try:
+        data = orjson.loads(request.get_data(cache=False))
+    except orjson.JSONDecodeError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def stream_rows(key: str, query: str, params=()) -> Response:
+    """Stream ``{key: [rows...], "count": N}`` one row at a time.
+
+    The pooled connection is held until the generator finishes (or the
+    client disconnects), then returned to the pool.
+    """
+    def generate():
+        with get_db() as db:
+            cursor = db.execute(query, params)
+            yield f'{{"{key}":['
+            count = 0
+            for row in cursor:
+                yield ("," if count else "") + app.json.dumps(dict(row))
+                count += 1
+            yield f'],"count":{count}}}'
+
+    return Response(stream_with_context(generate()), mimetype="application/json")
+
+
 # --- Middleware-like checks ---
 
+@app.before_request
 def guard():
-    """Check down mode and rate limit. Returns error response or None."""
+    """Check down mode and rate limit for /api/ routes, then apply the artificial delay.
+
+    Returning an error response short-circuits the route; None lets it run.
+    Admin routes and requests that match no route (404/405) are never
+    throttled. The delay is a plain time.sleep, which gevent's monkey
+    patching turns into a cooperative yield.
+    """
+    if request.routing_exception is not None or not request.path.startswith("/api/"):
+        return None
     if _is_down():
         return jsonify({"error": "Service Unavailable", "message": "Salesforce API is currently down for maintenance"}), 503
     if _check_rate_limit():
         return jsonify({"error": "Too Many Requests", "message": "Rate limit exceeded. Max 5 requests per 10 seconds."}), 429
+    time.sleep(WRITE_DELAY if request.method == "POST" else READ_DELAY)
     return None
 
 
@@ -63,49 +172,27 @@ def guard():
 
 @app.route("/api/contacts", methods=["GET"])
 def list_contacts():
-    err = guard()
-    if err:
-        return err
-
-    time.sleep(READ_DELAY)
-
-    db = get_db()
     company = request.args.get("company")
     if company:
-        rows = db.execute("SELECT * FROM contacts WHERE company = ? ORDER BY last_name", (company,)).fetchall()
-    else:
-        rows = db.execute("SELECT * FROM contacts ORDER BY last_name").fetchall()
-    db.close()
-
-    contacts = [dict(r) for r in rows]
-    return jsonify({"contacts": contacts, "count": len(contacts)})
+        return stream_rows("contacts", "SELECT * FROM contacts WHERE company = ? ORDER BY last_name", (company,))
+    return stream_rows("contacts", "SELECT * FROM contacts ORDER BY last_name")
 
 
 @app.route("/api/contacts", methods=["POST"])
 def create_contact():
-    err = guard()
-    if err:
-        return err
-
-    time.sleep(WRITE_DELAY)
-
-    data = request.json
-    required = ["first_name", "last_name", "email", "company", "title"]
-    for field in required:
-        if field not in data:
-            return jsonify({"error": f"Missing required field: {field}"}), 400
-
-    from datetime import datetime
-    db = get_db()
-    cursor = db.execute(
-        "INSERT INTO contacts (first_name, last_name, email, company, title, phone, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
-        (data["first_name"], data["last_name"], data["email"], data["company"],
-         data["title"], data.get("phone", ""), datetime.now().isoformat()),
-    )
-    db.commit()
-    contact_id = cursor.lastrowid
-    row = db.execute("SELECT * FROM contacts WHERE id = ?", (contact_id,)).fetchone()
-    db.close()
+    data = json_body()
+    if data is None:
+        return jsonify({"error": "Request body must be a JSON object"}), 400
+    missing = CONTACT_REQUIRED - data.keys()
+    if missing:
+        return jsonify({"error": f"Missing required fields: {', '.join(sorted(missing))}"}), 400
+
+    with get_db() as db:
+        row = db.execute(
+            "INSERT INTO contacts (first_name, last_name, email, company, title, phone, created_at) VALUES (?, ?, ?, ?, ?, ?, ?) RETURNING *",
+            (data["first_name"], data["last_name"], data["email"], data["company"],
+             data["title"], data.get("phone", ""), datetime.now().isoformat()),
+        ).fetchone()
 
     return jsonify({"contact": dict(row), "message": "Contact created successfully"}), 201
 
@@ -114,13 +201,6 @@ def create_contact():
 
 @app.route("/api/deals", methods=["GET"])
 def list_deals():
-    err = guard()
-    if err:
-        return err
-
-    time.sleep(READ_DELAY)
-
-    db = get_db()
     min_amount = request.args.get("min_amount", type=float)
     company = request.args.get("company")
 
@@ -139,38 +219,29 @@ def list_deals():
         query += " WHERE " + " AND ".join(conditions)
     query += " ORDER BY amount DESC"
 
-    rows = db.execute(query, params).fetchall()
-    db.close()
-
-    deals = [dict(r) for r in rows]
-    return jsonify({"deals": deals, "count": len(deals)})
+    return stream_rows("deals", query, params)
 
 
 @app.route("/api/deals", methods=["POST"])
 def create_deal():
-    err = guard()
-    if err:
-        return err
-
-    time.sleep(WRITE_DELAY)
-
-    data = request.json
-    required = ["name", "company", "amount", "stage", "close_date"]
-    for field in required:
-        if field not in data:
-            return jsonify({"error": f"Missing required field: {field}"}), 400
-
-    from datetime import datetime
-    db = get_db()
-    cursor = db.execute(
-        "INSERT INTO deals (name, company, amount, stage, close_date, contact_id, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
-        (data["name"], data["company"], data["amount"], data["stage"],
-         data["close_date"], data.get("contact_id"), datetime.now().isoformat()),
-    )
-    db.commit()
-    deal_id = cursor.lastrowid
-    row = db.execute("SELECT * FROM deals WHERE id = ?", (deal_id,)).fetchone()
-    db.close()
+    data = json_body()
+    if data is None:
+        return jsonify({"error": "Request body must be a JSON object"}), 400
+    missing = DEAL_REQUIRED - data.keys()
+    if missing:
+        return jsonify({"error": f"Missing required fields: {', '.join(sorted(missing))}"}), 400
+
+    with get_db() as db:
+        row = db.execute(
+            # RETURNING hands an integral REAL back as an int (typeof() still says
+            # 'real'), so widen those to match a later SELECT. A non-numeric amount
+            # is stored as TEXT and echoed unchanged rather than cast to 0.0.
+            "INSERT INTO deals (name, company, amount, stage, close_date, contact_id, created_at) VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "RETURNING id, name, company, CASE typeof(amount) WHEN 'real' THEN amount * 1.0 ELSE amount END AS amount, "
+            "stage, close_date, contact_id, created_at",
+            (data["name"], data["company"], data["amount"], data["stage"],
+             data["close_date"], data.get("contact_id"), datetime.now().isoformat()),
+        ).fetchone()
 
     return jsonify({"deal": dict(row), "message": "Deal created successfully"}), 201
 
@@ -192,17 +263,16 @@ def toggle_down():
 def reset_rate_limit():
     """Reset rate limit counters."""
     with _rate_lock:
-        _request_timestamps.clear()
+        _request_times.clear()
     return jsonify({"message": "Rate limit reset"})
 
 
 @app.route("/admin/status", methods=["GET"])
 def status():
-    with _down_lock:
-        down = _down_mode
+    down = _is_down()
     with _rate_lock:
-        now = time.time()
-        recent = len([t for t in _request_timestamps if now - t < RATE_WINDOW])
+        _prune(time.monotonic())
+        recent = len(_request_times)
     return jsonify({"down_mode": down, "recent_requests": recent, "rate_limit": RATE_LIMIT})
 
 
@@ -217,6 +287,18 @@ if __name__ == "__main__":
     print(f"  Read delay:   {READ_DELAY}s")
     print(f"  Write delay:  {WRITE_DELAY}s")
     print(f"  Rate limit:   {RATE_LIMIT} req / {RATE_WINDOW}s")
-    print(f"  Database:     {DB_PATH}\n")
-
-    app.run(host="127.0.0.1", port=5555, debug=False)
+    print(f"  Database:     {DB_PATH}\n", flush=True)
+
+    # A single gevent worker serves many concurrently sleeping requests while
+    # keeping down mode and rate-limit state in one process. gunicorn runs as a
+    # module under this interpreter, so an unactivated venv works without its
+    # scripts dir on PATH.
+    os.execv(sys.executable, [
+        sys.executable, "-m", "gunicorn",
+        "--chdir", os.path.dirname(os.path.abspath(__file__)),
+        "-k", "gevent",
+        "-w", "1",
+        "--worker-connections", "1000",
+        "-b", "127.0.0.1:5555",
+        "mock_crm_server:app",
+    ])
@@ -4,6 +4,7 @@
 import sqlite3
 import os
 import random
+from collections import Counter
 from datetime import datetime, timedelta
 
 DB_PATH = os.path.join(os.path.dirname(__file__), "crm_data.db")
@@ -16,6 +17,8 @@ COMPANIES = [
     "Aperture Science",
 ]
 
+_COMPANY_DOMAIN = {c: c.lower().replace(" ", "").replace(".", "") + ".com" for c in COMPANIES}
+
 FIRST_NAMES = [
     "James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael",
     "Linda", "David", "Elizabeth", "William", "Barbara", "Richard", "Susan",
@@ -83,68 +86,74 @@ def create_tables(conn: sqlite3.Connection):
             FOREIGN KEY (contact_id) REFERENCES contacts(id)
         )
     """)
+    # Match the API's filter + ORDER BY shapes so SQLite can walk them in order
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_contacts_company_last ON contacts(company, last_name)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_deals_company_amount ON deals(company, amount DESC)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_deals_amount ON deals(amount DESC)")
     conn.commit()
 
 
 def seed_contacts(conn: sqlite3.Connection, count: int = 47) -> list[int]:
-    contact_ids = []
-    used_emails = set()
+    rows = []
+    seen = Counter()  # (first, last, company) -> occurrences so far
     now = datetime.now()
-
-    for _ in range(count):
-        first = random.choice(FIRST_NAMES)
-        last = random.choice(LAST_NAMES)
-        company = random.choice(COMPANIES)
-        title = random.choice(TITLES)
-        domain = company.lower().replace(" ", "").replace(".", "") + ".com"
-        base_email = f"{first.lower()}.{last.lower()}@{domain}"
-
-        # Ensure unique emails
-        email = base_email
-        suffix = 1
-        while email in used_emails:
-            email = f"{first.lower()}.{last.lower()}{suffix}@{domain}"
-            suffix += 1
-        used_emails.add(email)
-
-        phone = f"+1-{random.randint(200,999)}-{random.randint(100,999)}-{random.randint(1000,9999)}"
-        created = (now - timedelta(days=random.randint(1, 365))).isoformat()
-
-        cursor = conn.execute(
-            "INSERT INTO contacts (first_name, last_name, email, company, title, phone, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
-            (first, last, email, company, title, phone, created),
+    # Bind RNG methods once; draws stay in the same order so seed(42) data is stable
+    choice, randint = random.choice, random.randint
+
+    for contact_id in range(1, count + 1):
+        first = choice(FIRST_NAMES)
+        last = choice(LAST_NAMES)
+        company = choice(COMPANIES)
+        title = choice(TITLES)
+        domain = _COMPANY_DOMAIN[company]
+
+        # Ensure unique emails: repeat name+company combos get a numeric suffix
+        n = seen[(first, last, company)]
+        seen[(first, last, company)] += 1
+        email = f"{first.lower()}.{last.lower()}{n or ''}@{domain}"
+
+        phone = f"+1-{randint(200,999)}-{randint(100,999)}-{randint(1000,9999)}"
+        created = (now - timedelta(days=randint(1, 365))).isoformat()
+
+        rows.append((contact_id, first, last, email, company, title, phone, created))
+
+    # Explicit ids let deals reference contacts without reading back lastrowid
+    with conn:
+        conn.executemany(
+            "INSERT INTO contacts (id, first_name, last_name, email, company, title, phone, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
         )
-        contact_ids.append(cursor.lastrowid)
-
-    conn.commit()
-    return contact_ids
+    return [row[0] for row in rows]
 
 
 def seed_deals(conn: sqlite3.Connection, contact_ids: list[int], count: int = 23):
+    rows = []
     now = datetime.now()
+    choice, randint, uniform = random.choice, random.randint, random.uniform
 
     for _ in range(count):
-        company = random.choice(COMPANIES)
-        template = random.choice(DEAL_NAMES_TEMPLATES)
+        company = choice(COMPANIES)
+        template = choice(DEAL_NAMES_TEMPLATES)
         name = template.format(company=company)
-        amount = round(random.choice([
-            random.uniform(5000, 25000),
-            random.uniform(25000, 75000),
-            random.uniform(75000, 200000),
-            random.uniform(200000, 500000),
+        amount = round(choice([
+            uniform(5000, 25000),
+            uniform(25000, 75000),
+            uniform(75000, 200000),
+            uniform(200000, 500000),
         ]), 2)
-        stage = random.choice(DEAL_STAGES)
-        close_date = (now + timedelta(days=random.randint(-30, 180))).strftime("%Y-%m-%d")
-        contact_id = random.choice(contact_ids)
-        created = (now - timedelta(days=random.randint(1, 180))).isoformat()
+        stage = choice(DEAL_STAGES)
+        close_date = (now + timedelta(days=randint(-30, 180))).strftime("%Y-%m-%d")
+        contact_id = choice(contact_ids)
+        created = (now - timedelta(days=randint(1, 180))).isoformat()
+
+        rows.append((name, company, amount, stage, close_date, contact_id, created))
 
-        conn.execute(
+    with conn:
+        conn.executemany(
             "INSERT INTO deals (name, company, amount, stage, close_date, contact_id, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
-            (name, company, amount, stage, close_date, contact_id, created),
+            rows,
         )
 
-    conn.commit()
-
 
 def seed(db_path: str = DB_PATH):
     if os.path.exists(db_path):